@@ -18,9 +18,9 @@ class RateLimitExceeded(HTTPException):
         self.limit = limit
         if limit.error_message:
             description: str = (
-                limit.error_message
-                if not callable(limit.error_message)
-                else limit.error_message()
+                limit.error_message()  # type: ignore
+                if limit._error_message_is_callable
+                else limit.error_message
             )
         else:
             description = str(limit.limit)
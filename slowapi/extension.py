@@ -3,13 +3,15 @@ The starlette extension to rate-limit requests
 """
 
 import asyncio
+import base64
 import functools
+import hashlib
 import inspect
 import itertools
 import logging
 import os
 import time
-from datetime import datetime
+from datetime import datetime, timezone
 from email.utils import formatdate, parsedate_to_datetime
 from functools import wraps
 from typing import (
@@ -18,6 +20,7 @@ from typing import (
     Dict,
     List,
     Optional,
+    Sequence,
     Set,
     Tuple,
     TypeVar,
@@ -71,6 +74,45 @@ class HEADERS:
 
 
 MAX_BACKEND_CHECKS = 5
+# ASGI scope key flagging requests whose limits were already checked, it lives in
+# the scope rather than in `request.state` to avoid the `State.__getattr__` fallback
+RATE_LIMITING_COMPLETE = "slowapi.rate_limiting_complete"
+# exponential backoff between two storage checks, in nanoseconds
+_BACKEND_CHECK_BACKOFF_NS = tuple(
+    (1 << count) * 1_000_000_000 for count in range(MAX_BACKEND_CHECKS + 1)
+)
+
+
+@functools.lru_cache(maxsize=4)
+def _http_date(timestamp: int) -> str:
+    """
+    `formatdate` for Retry-After headers, all the requests of a window share the
+    same reset time so the last few values are kept around
+    """
+    return formatdate(timestamp)
+
+
+def _hash_key(args: List[Any]) -> str:
+    """
+    128 bits blake2b hash of the storage key identifiers, as 22 urlsafe base64 chars
+    """
+    # key functions may return non-str identifiers, limits' key_for str()s them too
+    key = "/".join(str(arg) for arg in args)
+    digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+    return base64.urlsafe_b64encode(digest).rstrip(b"=").decode()
+
+
+class _BlackHoleHandler(logging.Handler):
+    """
+    Discard log records, so that the "slowapi" logger doesn't fall back on the
+    last resort handler when the application doesn't configure logging.
+    """
+
+    def emit(self, record: logging.LogRecord) -> None:
+        return
+
+
+_BLACK_HOLE_HANDLER = _BlackHoleHandler()
 
 
 def _rate_limit_exceeded_handler(request: Request, exc: RateLimitExceeded) -> Response:
@@ -125,6 +167,8 @@ class Limiter:
     * **config_filename**: name of the config file for Starlette from which to load settings
      for the rate limiter. Defaults to ".env".
     * **key_style**: set to "url" to use the url, "endpoint" to use the view_func
+    * **key_hash**: set to "blake2b-128" to replace the identifiers of storage keys
+     (prefix, key and scope) with a fixed size hash of them (default: "none")
     """
 
     def __init__(
@@ -146,6 +190,7 @@ class Limiter:
         enabled: bool = True,
         config_filename: Optional[str] = None,
         key_style: Literal["endpoint", "url"] = "url",
+        key_hash: Literal["none", "blake2b-128"] = "none",
     ) -> None:
         """
         Configure the rate limiter at app level
@@ -156,22 +201,17 @@ class Limiter:
 
         self.logger = logging.getLogger("slowapi")
 
-        dotenv_file_exists = os.path.isfile(".env")
-        self.app_config = Config(
-            ".env"
-            if dotenv_file_exists and config_filename is None
-            else config_filename
-        )
+        # only look for a ".env" file when no config file was given
+        if config_filename is None and os.path.isfile(".env"):
+            config_filename = ".env"
+        self.app_config = Config(config_filename)
 
         self.enabled = enabled
-        self._default_limits = []
-        self._application_limits = []
-        self._in_memory_fallback: List[LimitGroup] = []
         self._in_memory_fallback_enabled = (
             in_memory_fallback_enabled or len(in_memory_fallback) > 0
         )
         self._exempt_routes: Set[str] = set()
-        self._request_filters: List[Callable[..., bool]] = []
+        self._request_filters: Tuple[Callable[..., bool], ...] = ()
         self._headers_enabled = headers_enabled
         self._header_mapping: Dict[int, str] = {}
         self._retry_after: Optional[str] = retry_after
@@ -184,53 +224,36 @@ class Limiter:
         self._key_func = key_func
         self._key_prefix = key_prefix
         self._key_style = key_style
-
-        for limit in set(default_limits):
-            self._default_limits.extend(
-                [
-                    LimitGroup(
-                        limit, self._key_func, None, False, None, None, None, 1, False
-                    )
-                ]
-            )
-        for limit in application_limits:
-            self._application_limits.extend(
-                [
-                    LimitGroup(
-                        limit,
-                        self._key_func,
-                        "global",
-                        False,
-                        None,
-                        None,
-                        None,
-                        1,
-                        False,
-                    )
-                ]
-            )
-        for limit in in_memory_fallback:
-            self._in_memory_fallback.extend(
-                [
-                    LimitGroup(
-                        limit, self._key_func, None, False, None, None, None, 1, False
-                    )
-                ]
+        if key_hash not in ("none", "blake2b-128"):
+            raise ConfigurationError("Invalid key hash %s" % key_hash)
+        self._key_hash = key_hash != "none"
+
+        self._default_limits: List[LimitGroup] = [
+            LimitGroup(limit, self._key_func, None, False, None, None, None, 1, False)
+            for limit in set(default_limits)
+        ]
+        self._application_limits: List[LimitGroup] = [
+            LimitGroup(
+                limit, self._key_func, "global", False, None, None, None, 1, False
             )
+            for limit in application_limits
+        ]
+        self._in_memory_fallback: List[LimitGroup] = [
+            LimitGroup(limit, self._key_func, None, False, None, None, None, 1, False)
+            for limit in in_memory_fallback
+        ]
         self._route_limits: Dict[str, List[Limit]] = {}
         self._dynamic_route_limits: Dict[str, List[LimitGroup]] = {}
         # a flag to note if the storage backend is dead (not available)
         self._storage_dead: bool = False
         self._fallback_limiter = None
         self.__check_backend_count = 0
-        self.__last_check_backend = time.time()
+        self.__last_check_backend = time.monotonic_ns()
         self.__marked_for_limiting: Dict[str, List[Callable]] = {}
 
-        class BlackHoleHandler(logging.StreamHandler):
-            def emit(*_):
-                return
-
-        self.logger.addHandler(BlackHoleHandler())
+        # the "slowapi" logger is shared by all the limiters, only silence it once
+        if not any(isinstance(h, _BlackHoleHandler) for h in self.logger.handlers):
+            self.logger.addHandler(_BLACK_HOLE_HANDLER)
 
         self.enabled = self.get_app_config(C.ENABLED, self.enabled)
         self._swallow_errors = self.get_app_config(
@@ -268,6 +291,11 @@ class Limiter:
                 ),
             }
         )
+        # header names are fixed from now on, keep them at hand for _inject_headers
+        self._header_limit = self._header_mapping[HEADERS.LIMIT]
+        self._header_remaining = self._header_mapping[HEADERS.REMAINING]
+        self._header_reset = self._header_mapping[HEADERS.RESET]
+        self._header_retry_after = self._header_mapping[HEADERS.RETRY_AFTER]
         self._retry_after = self._retry_after or self.get_app_config(
             C.HEADER_RETRY_AFTER_VALUE
         )
@@ -326,6 +354,17 @@ class Limiter:
             self._fallback_storage = MemoryStorage()
             self._fallback_limiter = STRATEGIES[strategy](self._fallback_storage)
 
+        # static limit strings never change, parse them once instead of per request
+        self._flat_application_limits = self.__flatten_limits(
+            self._application_limits, "application limits"
+        )
+        self._flat_default_limits = self.__flatten_limits(
+            self._default_limits, "default limits"
+        )
+        self._flat_in_memory_fallback = self.__flatten_limits(
+            self._in_memory_fallback, "in memory fallback"
+        )
+
     def slowapi_startup(self) -> None:
         """
         Starlette startup event handler that links the app with the Limiter instance.
@@ -343,11 +382,52 @@ class Limiter:
             else self.app_config(key, default=default_value)
         )
 
+    def __flatten_limits(
+        self, groups: List[LimitGroup], name: str
+    ) -> Tuple[Tuple[Limit, ...], Tuple[LimitGroup, ...]]:
+        """
+        Split limit groups into the already parsed static limits, and the dynamic
+        groups that have to be resolved on each request.
+        Invalid static limits are logged and skipped, like in the limit decorator.
+        """
+        static_limits: List[Limit] = []
+        dynamic_groups: List[LimitGroup] = []
+        for group in groups:
+            if group.is_dynamic:
+                dynamic_groups.append(group)
+                continue
+            try:
+                static_limits.extend(list(group))
+            except ValueError as e:
+                self.logger.error(
+                    "Failed to configure throttling for %s (%s)",
+                    name,
+                    e,
+                )
+        return tuple(static_limits), tuple(dynamic_groups)
+
+    @staticmethod
+    def __resolve_limits(
+        flat_limits: Tuple[Tuple[Limit, ...], Tuple[LimitGroup, ...]]
+    ) -> Sequence[Limit]:
+        """
+        The limits to check for a request. Static limits are returned as is and must
+        not be modified.
+        """
+        static_limits, dynamic_groups = flat_limits
+        if not dynamic_groups:
+            return static_limits
+        return list(itertools.chain(static_limits, *dynamic_groups))
+
     def __should_check_backend(self) -> bool:
-        if self.__check_backend_count > MAX_BACKEND_CHECKS:
-            self.__check_backend_count = 0
-        if time.time() - self.__last_check_backend > pow(2, self.__check_backend_count):
-            self.__last_check_backend = time.time()
+        # read the counter once, sync endpoints may bump it concurrently from the
+        # threadpool and the backoff table only covers 0..MAX_BACKEND_CHECKS
+        count = self.__check_backend_count
+        if count > MAX_BACKEND_CHECKS:
+            count = self.__check_backend_count = 0
+        now = time.monotonic_ns()
+        if now - self.__last_check_backend > _BACKEND_CHECK_BACKOFF_NS[count]:
+            self.__last_check_backend = now
             self.__check_backend_count += 1
             return True
         return False
@@ -383,49 +463,7 @@ class Limiter:
                 raise Exception(
                     "parameter `response` must be an instance of starlette.responses.Response"
                 )
-            try:
-                window_stats: Tuple[int, int] = self.limiter.get_window_stats(
-                    current_limit[0], *current_limit[1]
-                )
-                reset_in = 1 + window_stats[0]
-                response.headers.append(
-                    self._header_mapping[HEADERS.LIMIT], str(current_limit[0].amount)
-                )
-                response.headers.append(
-                    self._header_mapping[HEADERS.REMAINING], str(window_stats[1])
-                )
-                response.headers.append(
-                    self._header_mapping[HEADERS.RESET], str(reset_in)
-                )
-
-                # response may have an existing retry after
-                existing_retry_after_header = response.headers.get("Retry-After")
-
-                if existing_retry_after_header is not None:
-                    reset_in = max(
-                        self._determine_retry_time(existing_retry_after_header),
-                        reset_in,
-                    )
-
-                response.headers[self._header_mapping[HEADERS.RETRY_AFTER]] = (
-                    formatdate(reset_in)
-                    if self._retry_after == "http-date"
-                    else str(int(reset_in - time.time()))
-                )
-            except:
-                if self._in_memory_fallback and not self._storage_dead:
-                    self.logger.warning(
-                        "Rate limit storage unreachable - falling back to"
-                        " in-memory storage"
-                    )
-                    self._storage_dead = True
-                    response = self._inject_headers(response, current_limit)
-                if self._swallow_errors:
-                    self.logger.exception(
-                        "Failed to update rate limit headers. Swallowing error"
-                    )
-                else:
-                    raise
+            self._inject_asgi_headers(response.headers, current_limit)
         return response
 
     def _inject_asgi_headers(
@@ -435,7 +473,7 @@ class Limiter:
         Injects 'X-RateLimit-Reset', 'X-RateLimit-Remaining', 'X-RateLimit-Limit'
         and 'Retry-After' headers into :headers parameter if needed.
 
-        Basically the same as _inject_headers, but without access to the Response object.
+        Shared by _inject_headers, it works without access to the Response object
         -> supports ASGI Middlewares.
         """
         if self.enabled and self._headers_enabled and current_limit is not None:
@@ -444,11 +482,9 @@ class Limiter:
                     current_limit[0], *current_limit[1]
                 )
                 reset_in = 1 + window_stats[0]
-                headers[self._header_mapping[HEADERS.LIMIT]] = str(
-                    current_limit[0].amount
-                )
-                headers[self._header_mapping[HEADERS.REMAINING]] = str(window_stats[1])
-                headers[self._header_mapping[HEADERS.RESET]] = str(reset_in)
+                headers[self._header_limit] = str(current_limit[0].amount)
+                headers[self._header_remaining] = str(window_stats[1])
+                headers[self._header_reset] = str(reset_in)
 
                 # response may have an existing retry after
                 existing_retry_after_header = headers.get("Retry-After")
@@ -459,8 +495,8 @@ class Limiter:
                         reset_in,
                     )
 
-                headers[self._header_mapping[HEADERS.RETRY_AFTER]] = (
-                    formatdate(reset_in)
+                headers[self._header_retry_after] = (
+                    _http_date(int(reset_in))
                     if self._retry_after == "http-date"
                     else str(int(reset_in - time.time()))
                 )
@@ -481,20 +517,26 @@ class Limiter:
         return headers
 
     def __evaluate_limits(
-        self, request: Request, endpoint: str, limits: List[Limit]
+        self, request: Request, endpoint: str, limits: Sequence[Limit]
     ) -> None:
+        # resolve the (possibly fallback) rate limiter once for all the limits
+        hit = self.limiter.hit
         failed_limit = None
         limit_for_header = None
+        # granularity of limit_for_header, RateLimitItem.__lt__ only compares those
+        header_granularity = 0
+        method = request.method
         for lim in limits:
             limit_scope = lim.scope or endpoint
-            if lim.is_exempt(request):
+            # most limits have no exempt_when, skip the method call for those
+            if lim.exempt_when is not None and lim.is_exempt(request):
                 continue
-            if lim.methods is not None and request.method.lower() not in lim.methods:
+            if lim.methods is not None and method not in lim.methods:
                 continue
             if lim.per_method:
-                limit_scope += ":%s" % request.method
+                limit_scope += ":%s" % method
 
-            if "request" in inspect.signature(lim.key_func).parameters.keys():
+            if lim._key_func_takes_request:
                 limit_key = lim.key_func(request)
             else:
                 limit_key = lim.key_func()
@@ -503,11 +545,18 @@ class Limiter:
             if all(args):
                 if self._key_prefix:
                     args = [self._key_prefix] + args
-                if not limit_for_header or lim.limit < limit_for_header[0]:
+                if self._key_hash:
+                    args = [_hash_key(args)]
+                if not limit_for_header or lim.granularity < header_granularity:
                     limit_for_header = (lim.limit, args)
+                    header_granularity = lim.granularity
 
-                cost = lim.cost(request) if callable(lim.cost) else lim.cost
-                if not self.limiter.hit(lim.limit, *args, cost=cost):
+                cost: int = (
+                    lim.cost(request)  # type: ignore  # narrowed by _cost_is_callable
+                    if lim._cost_is_callable
+                    else lim.cost
+                )
+                if not hit(lim.limit, *args, cost=cost):
                     self.logger.warning(
                         "ratelimit %s (%s) exceeded at endpoint: %s",
                         lim.limit,
@@ -529,6 +578,14 @@ class Limiter:
             raise RateLimitExceeded(failed_limit)
 
     def _determine_retry_time(self, retry_header_value) -> int:
+        # delay-seconds is much cheaper to parse than an http-date, try it first
+        try:
+            retry_after_int: int = int(retry_header_value)
+        except (TypeError, ValueError):
+            pass
+        else:
+            return int(time.time() + retry_after_int)
+
         try:
             retry_after_date: Optional[datetime] = parsedate_to_datetime(
                 retry_header_value
@@ -536,67 +593,68 @@ class Limiter:
         except (TypeError, ValueError):
             retry_after_date = None
 
-        if retry_after_date is not None:
-            return int(time.mktime(retry_after_date.timetuple()))
-
-        try:
-            retry_after_int: int = int(retry_header_value)
-        except TypeError:
+        if retry_after_date is None:
             raise ValueError(
                 "Retry-After Header does not meet RFC2616 - value is not of http-date or int type."
             )
 
-        return int(time.time() + retry_after_int)
+        # "-0000" dates (what formatdate writes) parse as naive datetimes, that
+        # .timestamp() would read in local time
+        if retry_after_date.tzinfo is None:
+            retry_after_date = retry_after_date.replace(tzinfo=timezone.utc)
+        return int(retry_after_date.timestamp())
 
     def _check_request_limit(
         self,
         request: Request,
         endpoint_func: Optional[Callable[..., Any]],
         in_middleware: bool = True,
+        endpoint_func_name: Optional[str] = None,
     ) -> None:
         """
         Determine if the request is within limits
+
+        `endpoint_func_name` can be given by callers that already know the route name
+        (i.e. the decorators) to avoid rebuilding it on each request.
         """
-        endpoint_url = request["path"] or ""
+        if not self.enabled:
+            return
+        endpoint_url = request.scope.get("path") or ""
+        if self._key_style == "url" and not endpoint_url:
+            return
         view_func = endpoint_func
 
-        endpoint_func_name = (
-            f"{view_func.__module__}.{view_func.__name__}" if view_func else ""
-        )
+        if endpoint_func_name is None:
+            endpoint_func_name = (
+                f"{view_func.__module__}.{view_func.__name__}" if view_func else ""
+            )
         _endpoint_key = endpoint_url if self._key_style == "url" else endpoint_func_name
         # cases where we don't need to check the limits
         if (
             not _endpoint_key
-            or not self.enabled
             # or we are sending a static file
             # or view_func == current_app.send_static_file
             or endpoint_func_name in self._exempt_routes
-            or any(fn() for fn in self._request_filters)
+            or (self._request_filters and any(fn() for fn in self._request_filters))
         ):
             return
         limits: List[Limit] = []
         dynamic_limits: List[Limit] = []
 
         if not in_middleware:
-            limits = (
-                self._route_limits[endpoint_func_name]
-                if endpoint_func_name in self._route_limits
-                else []
-            )
-            dynamic_limits = []
-            if endpoint_func_name in self._dynamic_route_limits:
-                for lim in self._dynamic_route_limits[endpoint_func_name]:
-                    try:
-                        dynamic_limits.extend(list(lim.with_request(request)))
-                    except ValueError as e:
-                        self.logger.error(
-                            "failed to load ratelimit for view function %s (%s)",
-                            endpoint_func_name,
-                            e,
-                        )
+            limits = self._route_limits.get(endpoint_func_name, limits)
+            for lim in self._dynamic_route_limits.get(endpoint_func_name, ()):
+                try:
+                    dynamic_limits.extend(list(lim.with_request(request)))
+                except ValueError as e:
+                    self.logger.error(
+                        "failed to load ratelimit for view function %s (%s)",
+                        endpoint_func_name,
+                        e,
+                    )
 
         try:
-            all_limits: List[Limit] = []
+            all_limits: Sequence[Limit] = ()
             if self._storage_dead and self._fallback_limiter:
                 if in_middleware and endpoint_func_name in self.__marked_for_limiting:
                     pass
@@ -606,15 +664,17 @@ class Limiter:
                         self._storage_dead = False
                         self.__check_backend_count = 0
                     else:
-                        all_limits = list(itertools.chain(*self._in_memory_fallback))
+                        all_limits = self.__resolve_limits(
+                            self._flat_in_memory_fallback
+                        )
             if not all_limits:
                 route_limits: List[Limit] = limits + dynamic_limits
-                all_limits = (
-                    list(itertools.chain(*self._application_limits))
-                    if in_middleware
-                    else []
-                )
-                all_limits += route_limits
+                request_limits: List[Limit] = []
+                if in_middleware:
+                    request_limits.extend(
+                        self.__resolve_limits(self._flat_application_limits)
+                    )
+                request_limits += route_limits
                 combined_defaults = all(
                     not limit.override_defaults for limit in route_limits
                 )
@@ -626,7 +686,10 @@ class Limiter:
                     )
                     or combined_defaults
                 ):
-                    all_limits += list(itertools.chain(*self._default_limits))
+                    request_limits.extend(
+                        self.__resolve_limits(self._flat_default_limits)
+                    )
+                all_limits = request_limits
             # actually check the limits, so far we've only computed the list of limits to check
             self.__evaluate_limits(request, _endpoint_key, all_limits)
         except Exception as e:  # no qa
@@ -638,7 +701,9 @@ class Limiter:
                     " in-memory storage"
                 )
                 self._storage_dead = True
-                self._check_request_limit(request, endpoint_func, in_middleware)
+                self._check_request_limit(
+                    request, endpoint_func, in_middleware, endpoint_func_name
+                )
             else:
                 if self._swallow_errors:
                     self.logger.exception("Failed to rate limit. Swallowing error")
@@ -704,8 +769,9 @@ class Limiter:
             else:
                 self._route_limits.setdefault(name, []).extend(static_limits)
 
-            sig = inspect.signature(func)
-            for idx, parameter in enumerate(sig.parameters.values()):
+            for idx, parameter in enumerate(
+                inspect.signature(func).parameters.values()
+            ):
                 if parameter.name == "request" or parameter.name == "websocket":
                     break
             else:
@@ -719,19 +785,23 @@ class Limiter:
                 async def async_wrapper(*args: Any, **kwargs: Any) -> Response:
                     # get the request object from the decorated endpoint function
                     if self.enabled:
-                        request = kwargs.get("request", args[idx] if args else None)
+                        # endpoints are called with keyword arguments by FastAPI,
+                        # only fall back on the positional lookup when needed
+                        request: Any = kwargs.get("request")
+                        if request is None and len(args) > idx:
+                            request = args[idx]
                         if not isinstance(request, Request):
                             raise Exception(
                                 "parameter `request` must be an instance of starlette.requests.Request"
                             )
 
-                        if self._auto_check and not getattr(
-                            request.state, "_rate_limiting_complete", False
+                        if self._auto_check and not request.scope.get(
+                            RATE_LIMITING_COMPLETE
                         ):
-                            self._check_request_limit(request, func, False)
-                            request.state._rate_limiting_complete = True
+                            self._check_request_limit(request, func, False, name)
+                            request.scope[RATE_LIMITING_COMPLETE] = True
                     response = await func(*args, **kwargs)  # type: ignore
-                    if self.enabled:
+                    if self.enabled and self._headers_enabled:
                         if not isinstance(response, Response):
                             # get the response object from the decorated endpoint function
                             self._inject_headers(
@@ -744,6 +814,7 @@ class Limiter:
                             )
                     return response
 
+                setattr(async_wrapper, "_slowapi_route_name", name)
                 return async_wrapper
 
             else:
@@ -752,19 +823,23 @@ class Limiter:
                 def sync_wrapper(*args: Any, **kwargs: Any) -> Response:
                     # get the request object from the decorated endpoint function
                     if self.enabled:
-                        request = kwargs.get("request", args[idx] if args else None)
+                        # endpoints are called with keyword arguments by FastAPI,
+                        # only fall back on the positional lookup when needed
+                        request: Any = kwargs.get("request")
+                        if request is None and len(args) > idx:
+                            request = args[idx]
                         if not isinstance(request, Request):
                             raise Exception(
                                 "parameter `request` must be an instance of starlette.requests.Request"
                             )
 
-                        if self._auto_check and not getattr(
-                            request.state, "_rate_limiting_complete", False
+                        if self._auto_check and not request.scope.get(
+                            RATE_LIMITING_COMPLETE
                         ):
-                            self._check_request_limit(request, func, False)
-                            request.state._rate_limiting_complete = True
+                            self._check_request_limit(request, func, False, name)
+                            request.scope[RATE_LIMITING_COMPLETE] = True
                     response = func(*args, **kwargs)
-                    if self.enabled:
+                    if self.enabled and self._headers_enabled:
                         if not isinstance(response, Response):
                             # get the response object from the decorated endpoint function
                             self._inject_headers(
@@ -777,6 +852,7 @@ class Limiter:
                             )
                     return response
 
+                setattr(sync_wrapper, "_slowapi_route_name", name)
                 return sync_wrapper
 
         return decorator
@@ -866,7 +942,7 @@ class Limiter:
         """
         Decorator to mark a view as exempt from rate limits.
         """
-        name = "%s.%s" % (obj.__module__, obj.__name__)
+        name = f"{obj.__module__}.{obj.__name__}"
 
         self._exempt_routes.add(name)
 
@@ -876,6 +952,7 @@ class Limiter:
             async def __async_inner(*a, **k):
                 return await obj(*a, **k)
 
+            setattr(__async_inner, "_slowapi_route_name", name)
             return __async_inner
         else:
 
@@ -883,4 +960,5 @@ class Limiter:
             def __inner(*a, **k):
                 return obj(*a, **k)
 
+            setattr(__inner, "_slowapi_route_name", name)
             return __inner
@@ -13,21 +13,27 @@ from starlette.routing import BaseRoute, Match
 from starlette.types import ASGIApp, Message, Scope, Receive, Send
 
 from slowapi import Limiter, _rate_limit_exceeded_handler
+from slowapi.errors import RateLimitExceeded
+from slowapi.extension import RATE_LIMITING_COMPLETE
 
 
 def _find_route_handler(
     routes: Iterable[BaseRoute], scope: Scope
 ) -> Optional[Callable]:
-    handler = None
+    # like starlette's router, the first full match is the one handling the request
     for route in routes:
         match, _ = route.matches(scope)
-        if match == Match.FULL and hasattr(route, "endpoint"):
-            handler = route.endpoint  # type: ignore
-    return handler
+        if match == Match.FULL:
+            return getattr(route, "endpoint", None)
+    return None
 
 
 def _get_route_name(handler: Callable):
-    return f"{handler.__module__}.{handler.__name__}"
+    # decorated and exempt endpoints carry their name, set by the Limiter
+    return (
+        getattr(handler, "_slowapi_route_name", None)
+        or f"{handler.__module__}.{handler.__name__}"
+    )
 
 
 def _check_limits(
@@ -40,17 +46,24 @@ def _check_limits(
         2. a bool, True if we need to inject some headers, False otherwise
         3. the exception that happened, if any
     """
-    if limiter._auto_check and not getattr(
-        request.state, "_rate_limiting_complete", False
-    ):
+    if limiter._auto_check and not request.scope.get(RATE_LIMITING_COMPLETE):
         try:
-            limiter._check_request_limit(request, handler, True)
-        except Exception as e:
+            limiter._check_request_limit(
+                request, handler, True, _get_route_name(handler)  # type: ignore
+            )
+        except RateLimitExceeded as e:
             # handle the exception since the global exception handler won't pick it up if we call_next
             exception_handler = app.exception_handlers.get(
-                type(e), _rate_limit_exceeded_handler
+                RateLimitExceeded, _rate_limit_exceeded_handler
             )
             return exception_handler, False, e
+        except Exception as e:
+            # other errors (i.e. storage failures) are only handled here if the app
+            # registered a handler for them, _rate_limit_exceeded_handler can't
+            error_handler = app.exception_handlers.get(type(e))
+            if error_handler is None:
+                raise
+            return error_handler, False, e
 
         return None, True, None
     return None, False, None
@@ -63,15 +76,18 @@ def sync_check_limits(
     Returns a `Response` object if an error occurred, as well as a boolean to know
     whether we should inject headers or not.
     Used in our WSGI middleware, it only supports synchronous exception_handler.
-    This will fallback on _rate_limit_exceeded_handler otherwise.
+    This will fallback on _rate_limit_exceeded_handler otherwise, or re-raise errors
+    that are not rate limits.
     """
     exception_handler, _bool, exc = _check_limits(limiter, request, handler, app)
     if not exception_handler or not exc:
         return None, _bool
 
     # cannot execute asynchronous code in a synchronous middleware,
-    # -> fallback on default exception handler
+    # -> fallback on default exception handler, which only handles rate limits
     if inspect.iscoroutinefunction(exception_handler):
+        if not isinstance(exc, RateLimitExceeded):
+            raise exc
         exception_handler = _rate_limit_exceeded_handler
 
     return exception_handler(request, exc), _bool  # type: ignore
@@ -100,6 +116,10 @@ def _should_exempt(limiter: Limiter, handler: Optional[Callable]) -> bool:
     if handler is None:
         return True
 
+    # no exempt nor decorated route, no need to build the route name
+    if not limiter._exempt_routes and not limiter._route_limits:
+        return False
+
     name = _get_route_name(handler)
 
     # if exempt no need to check
@@ -147,12 +167,28 @@ class SlowAPIASGIMiddleware:
         if scope["type"] != "http":
             return await self.app(scope, receive, send)
 
-        await _ASGIMiddlewareResponder(self.app)(scope, receive, send)
+        _app: Starlette = scope["app"]
+        limiter: Limiter = _app.state.limiter
+
+        # requests that are not rate limited here go straight to the app,
+        # without a responder wrapping their send
+        if not limiter.enabled:
+            return await self.app(scope, receive, send)
+
+        handler = _find_route_handler(_app.routes, scope)
+        if _should_exempt(limiter, handler):
+            return await self.app(scope, receive, send)
+
+        await _ASGIMiddlewareResponder(self.app, limiter, handler)(scope, receive, send)
 
 
 class _ASGIMiddlewareResponder:
-    def __init__(self, app: ASGIApp) -> None:
+    def __init__(
+        self, app: ASGIApp, limiter: Limiter, handler: Optional[Callable]
+    ) -> None:
         self.app = app
+        self.limiter = limiter
+        self.handler = handler
         self.error_response: Optional[Response] = None
         self.initial_message: Message = {}
         self.inject_headers = False
@@ -181,26 +217,15 @@ class _ASGIMiddlewareResponder:
     async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         self.send = send
 
-        _app: Starlette = scope["app"]
-        limiter: Limiter = _app.state.limiter
-
-        if not limiter.enabled:
-            return await self.app(scope, receive, self.send)
-
-        handler = _find_route_handler(_app.routes, scope)
         request = Request(scope, receive=receive, send=self.send)
-        if _should_exempt(limiter, handler):
-            return await self.app(scope, receive, self.send)
-
         error_response, should_inject_headers = await async_check_limits(
-            limiter, request, handler, _app
+            self.limiter, request, self.handler, scope["app"]
         )
         if error_response is not None:
             return await error_response(scope, receive, self.send_wrapper)
 
         if should_inject_headers:
             self.inject_headers = True
-            self.limiter = limiter
             self.request = request
 
         return await self.app(scope, receive, self.send_wrapper)
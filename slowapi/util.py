@@ -8,20 +8,22 @@ def get_ipaddr(request: Request) -> str:
      Note that a more robust method for determining IP address of the client is
      provided by uvicorn's ProxyHeadersMiddleware.
     """
-    if "X_FORWARDED_FOR" in request.headers:
-        return request.headers["X_FORWARDED_FOR"]
-    else:
-        if not request.client or not request.client.host:
-            return "127.0.0.1"
-
-        return request.client.host
+    # read the raw ASGI headers, names are lowercase there, instead of building
+    # request.headers for a single lookup
+    for key, value in request.scope["headers"]:
+        if key == b"x_forwarded_for":
+            if value:
+                return value.decode("latin-1")
+            break
+    return get_remote_address(request)
 
 
 def get_remote_address(request: Request) -> str:
     """
     Returns the ip address for the current request (or 127.0.0.1 if none found)
     """
-    if not request.client or not request.client.host:
+    client = request.client
+    if not client or not client.host:
         return "127.0.0.1"
 
-    return request.client.host
+    return client.host
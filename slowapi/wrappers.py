@@ -1,39 +1,87 @@
+import functools
 import inspect
-from typing import Callable, Iterator, List, Optional, Union
+from typing import (
+    Callable,
+    FrozenSet,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
 
 from limits import RateLimitItem, parse_many  # type: ignore
 from starlette.requests import Request
 
 
+@functools.lru_cache(maxsize=256)
+def _parse_many(limit_string: str) -> Tuple[RateLimitItem, ...]:
+    """
+    memoized `parse_many`, dynamic limit providers usually return one of a handful
+    of strings and parsing them again on each request is wasted work
+    """
+    return tuple(parse_many(limit_string))
+
+
 class Limit(object):
     """
     simple wrapper to encapsulate limits and their context
     """
 
+    __slots__ = (
+        "limit",
+        "granularity",
+        "key_func",
+        "_key_func_takes_request",
+        "__scope",
+        "_scope_is_callable",
+        "_static_scope",
+        "per_method",
+        "methods",
+        "error_message",
+        "_error_message_is_callable",
+        "exempt_when",
+        "_exempt_when_takes_request",
+        "cost",
+        "_cost_is_callable",
+        "override_defaults",
+    )
+
     def __init__(
         self,
         limit: RateLimitItem,
         key_func: Callable[..., str],
         scope: Optional[Union[str, Callable[..., str]]],
         per_method: bool,
-        methods: Optional[List[str]],
+        methods: Optional[FrozenSet[str]],
         error_message: Optional[Union[str, Callable[..., str]]],
         exempt_when: Optional[Callable[..., bool]],
         cost: Union[int, Callable[..., int]],
         override_defaults: bool,
     ) -> None:
         self.limit = limit
+        # granularity unit in seconds (60 for "10 per 2 minutes", not 120), what
+        # RateLimitItem.__lt__ compares when picking the limit reported in headers
+        self.granularity: int = limit.GRANULARITY[0]
         self.key_func = key_func
+        self._key_func_takes_request = (
+            "request" in inspect.signature(self.key_func).parameters
+        )
         self.__scope = scope
+        self._scope_is_callable = callable(scope)
+        self._static_scope = scope if isinstance(scope, str) else ""
         self.per_method = per_method
         self.methods = methods
         self.error_message = error_message
+        self._error_message_is_callable = callable(error_message)
         self.exempt_when = exempt_when
         self._exempt_when_takes_request = (
             self.exempt_when
             and len(inspect.signature(self.exempt_when).parameters) == 1
         )
         self.cost = cost
+        self._cost_is_callable = callable(cost)
         self.override_defaults = override_defaults
 
     def is_exempt(self, request: Optional[Request] = None) -> bool:
@@ -55,14 +103,9 @@ class Limit(object):
     def scope(self) -> str:
         # flack.request.endpoint is the name of the function for the endpoint
         # FIXME: how to get the request here?
-        if self.__scope is None:
-            return ""
-        else:
-            return (
-                self.__scope(request.endpoint)  # type: ignore
-                if callable(self.__scope)
-                else self.__scope
-            )
+        if self._scope_is_callable:
+            return self.__scope(request.endpoint)  # type: ignore
+        return self._static_scope
 
 
 class LimitGroup(object):
@@ -70,6 +113,22 @@ class LimitGroup(object):
     represents a group of related limits either from a string or a callable that returns one
     """
 
+    __slots__ = (
+        "__limit_provider",
+        "_provider_takes_key",
+        "__scope",
+        "key_function",
+        "_key_function_takes_request",
+        "per_method",
+        "methods",
+        "error_message",
+        "exempt_when",
+        "cost",
+        "override_defaults",
+        "request",
+        "_resolved",
+    )
+
     def __init__(
         self,
         limit_provider: Union[str, Callable[..., str]],
@@ -83,21 +142,33 @@ class LimitGroup(object):
         override_defaults: bool,
     ):
         self.__limit_provider = limit_provider
+        self._provider_takes_key = callable(limit_provider) and (
+            "key" in inspect.signature(limit_provider).parameters
+        )
         self.__scope = scope
         self.key_function = key_function
+        self._key_function_takes_request = (
+            "request" in inspect.signature(key_function).parameters
+        )
         self.per_method = per_method
-        self.methods = methods and [m.lower() for m in methods] or methods
+        # uppercased once like ASGI request methods, checking them is a set lookup
+        self.methods: Optional[FrozenSet[str]] = (
+            frozenset(m.upper() for m in methods) if methods is not None else None
+        )
         self.error_message = error_message
         self.exempt_when = exempt_when
         self.cost = cost
         self.override_defaults = override_defaults
         self.request = None
+        # last limit string and the limits built from it, providers mostly return
+        # the same string so the Limit objects can be reused
+        self._resolved: Optional[Tuple[str, Tuple[Limit, ...]]] = None
 
     def __iter__(self) -> Iterator[Limit]:
         if callable(self.__limit_provider):
-            if "key" in inspect.signature(self.__limit_provider).parameters.keys():
+            if self._provider_takes_key:
                 assert (
-                    "request" in inspect.signature(self.key_function).parameters.keys()
+                    self._key_function_takes_request
                 ), f"Limit provider function {self.key_function.__name__} needs a `request` argument"
                 if self.request is None:
                     raise Exception("`request` object can't be None")
@@ -106,9 +177,17 @@ class LimitGroup(object):
                 limit_raw = self.__limit_provider()
         else:
             limit_raw = self.__limit_provider
-        limit_items: List[RateLimitItem] = parse_many(limit_raw)
-        for limit in limit_items:
-            yield Limit(
+        resolved = self._resolved
+        if resolved is not None and resolved[0] == limit_raw:
+            yield from resolved[1]
+            return
+        limit_items: Sequence[RateLimitItem] = (
+            _parse_many(limit_raw)
+            if isinstance(limit_raw, str)
+            else parse_many(limit_raw)
+        )
+        limits = tuple(
+            Limit(
                 limit,
                 self.key_function,
                 self.__scope,
@@ -119,6 +198,17 @@ class LimitGroup(object):
                 self.cost,
                 self.override_defaults,
             )
+            for limit in limit_items
+        )
+        self._resolved = (limit_raw, limits)
+        yield from limits
+
+    @property
+    def is_dynamic(self) -> bool:
+        """
+        whether the limits come from a callable, and must be resolved on each request
+        """
+        return callable(self.__limit_provider)
 
     def with_request(self, request):
         self.request = request
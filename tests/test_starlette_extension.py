@@ -1,12 +1,23 @@
+import base64
+import hashlib
+import logging
 import time
+from dataclasses import dataclass
+from email.utils import formatdate
 
 import hiro  # type: ignore
 import pytest  # type: ignore
+from limits.errors import ConfigurationError  # type: ignore
+from mock import mock  # type: ignore
 from starlette.requests import Request
 from starlette.responses import PlainTextResponse
 from starlette.testclient import TestClient
 
+from slowapi import Limiter, wrappers
+from slowapi.errors import RateLimitExceeded
+from slowapi.middleware import SlowAPIMiddleware
 from slowapi.util import get_ipaddr, get_remote_address
+from slowapi.wrappers import _parse_many
 from tests import TestSlowapi
 
 
@@ -23,7 +34,7 @@ class TestDecorators(TestSlowapi):
         client = TestClient(app)
         for i in range(0, 10):
             response = client.get("/t1")
-            assert response.status_code == 200 if i < 5 else 429
+            assert response.status_code == (200 if i < 5 else 429)
             if i < 5:
                 assert response.text == "test"
 
@@ -39,7 +50,7 @@ class TestDecorators(TestSlowapi):
         client = TestClient(app)
         for i in range(0, 10):
             response = client.get("/t1")
-            assert response.status_code == 200 if i < 5 else 429
+            assert response.status_code == (200 if i < 5 else 429)
             if i < 5:
                 assert response.text == "test"
 
@@ -83,7 +94,7 @@ class TestDecorators(TestSlowapi):
         # Test always false hitting the limit after one hit
         for i in range(0, 2):
             response = client.get("/false")
-            assert response.status_code == 200 if i < 1 else 429
+            assert response.status_code == (200 if i < 1 else 429)
             if i < 1:
                 assert response.text == "test"
         # Test dynamic not exempting with the correct header
@@ -94,7 +105,7 @@ class TestDecorators(TestSlowapi):
         # Test dynamic exempting with the incorrect header
         for i in range(0, 2):
             response = client.get("/dynamic")
-            assert response.status_code == 200 if i < 1 else 429
+            assert response.status_code == (200 if i < 1 else 429)
             if i < 1:
                 assert response.text == "test"
 
@@ -117,7 +128,7 @@ class TestDecorators(TestSlowapi):
         client = TestClient(app)
         for i in range(0, 10):
             response = client.get("/t1")
-            assert response.status_code == 200 if i < 5 else 429
+            assert response.status_code == (200 if i < 5 else 429)
         # the shared limit has already been hit via t1
         assert client.get("/t2").status_code == 429
 
@@ -135,7 +146,7 @@ class TestDecorators(TestSlowapi):
             cli = TestClient(app)
             for i in range(0, 10):
                 response = cli.get("/t1", headers={"X_FORWARDED_FOR": "127.0.0.2"})
-                assert response.status_code == 200 if i < 5 else 429
+                assert response.status_code == (200 if i < 5 else 429)
             for i in range(5):
                 assert cli.get("/t1").status_code == 200
 
@@ -159,8 +170,10 @@ class TestDecorators(TestSlowapi):
             cli = TestClient(app)
             for i in range(0, 10):
                 response = cli.get("/t1", headers={"X_FORWARDED_FOR": "127.0.0.2"})
-                assert response.status_code == 200 if i < 5 else 429
+                assert response.status_code == (200 if i < 5 else 429)
                 assert response.headers.get("Retry-After") if i < 5 else True
+                # both decorators inject headers, they shouldn't be duplicated
+                assert len(response.headers.get_list("X-RateLimit-Limit")) == 1
             for i in range(5):
                 assert cli.get("/t1").status_code == 200
 
@@ -226,23 +239,25 @@ class TestDecorators(TestSlowapi):
                 )
                 assert resp.headers.get("Retry-After") == str(int(50))
 
-    def test_retry_after(self, build_starlette_app):
-        # FIXME: this test is not actually running!
-
+    @pytest.mark.parametrize("limit", ["1/second", "1/minute", "1/hour"])
+    def test_retry_after(self, build_starlette_app, limit):
         app, limiter = build_starlette_app(
             headers_enabled=True, key_func=get_remote_address
         )
 
         @app.route("/t1")
-        @limiter.limit("1/minute")
+        @limiter.limit(limit)
         def t(request: Request):
             return PlainTextResponse("test")
 
         with hiro.Timeline().freeze() as timeline:
             with TestClient(app) as cli:
                 resp = cli.get("/t1")
+                assert resp.status_code == 200
                 retry_after = int(resp.headers.get("Retry-After"))
                 assert retry_after > 0
+                resp = cli.get("/t1")
+                assert resp.status_code == 429
                 timeline.forward(retry_after)
                 resp = cli.get("/t1")
                 assert resp.status_code == 200
@@ -258,31 +273,30 @@ class TestDecorators(TestSlowapi):
         def t1(request: Request):
             return PlainTextResponse("test")
 
+        # the exempt routes are added while the app is already serving requests
         with TestClient(app) as cli:
             resp = cli.get("/t1", headers={"X_FORWARDED_FOR": "127.0.0.10"})
             assert resp.status_code == 200
             resp2 = cli.get("/t1", headers={"X_FORWARDED_FOR": "127.0.0.10"})
             assert resp2.status_code == 429
 
-        @app.route("/t2")
-        @limiter.exempt
-        def t2(request: Request):
-            """Exempt a sync route"""
-            return PlainTextResponse("test")
+            @app.route("/t2")
+            @limiter.exempt
+            def t2(request: Request):
+                """Exempt a sync route"""
+                return PlainTextResponse("test")
 
-        with TestClient(app) as cli:
             resp = cli.get("/t2", headers={"X_FORWARDED_FOR": "127.0.0.10"})
             assert resp.status_code == 200
             resp2 = cli.get("/t2", headers={"X_FORWARDED_FOR": "127.0.0.10"})
             assert resp2.status_code == 200
 
-        @app.route("/t3")
-        @limiter.exempt
-        async def t3(request: Request):
-            """Exempt an async route"""
-            return PlainTextResponse("test")
+            @app.route("/t3")
+            @limiter.exempt
+            async def t3(request: Request):
+                """Exempt an async route"""
+                return PlainTextResponse("test")
 
-        with TestClient(app) as cli:
             resp = cli.get("/t3", headers={"X_FORWARDED_FOR": "127.0.0.10"})
             assert resp.status_code == 200
             resp2 = cli.get("/t3", headers={"X_FORWARDED_FOR": "127.0.0.10"})
@@ -304,7 +318,7 @@ class TestDecorators(TestSlowapi):
             cli = TestClient(app)
             for i in range(0, 10):
                 response = cli.get("/t1", headers={"X_FORWARDED_FOR": "127.0.0.2"})
-                assert response.status_code == 200 if i < 5 else 429
+                assert response.status_code == (200 if i < 5 else 429)
             for i in range(5):
                 assert cli.get("/t1").status_code == 200
 
@@ -332,14 +346,14 @@ class TestDecorators(TestSlowapi):
         client = TestClient(app)
         for i in range(0, 10):
             response = client.get("/t1")
-            assert response.status_code == 200 if i < 5 else 429
+            assert response.status_code == (200 if i < 5 else 429)
             if i < 5:
                 assert response.text == "test"
             else:
                 assert "error" in response.json()
 
             response = client.get("/t2")
-            assert response.status_code == 200 if i < 3 else 429
+            assert response.status_code == (200 if i < 3 else 429)
             if i < 3:
                 assert response.text == "test"
             else:
@@ -365,14 +379,14 @@ class TestDecorators(TestSlowapi):
         client = TestClient(app)
         for i in range(0, 10):
             response = client.get("/t1", headers={"foo": "10"})
-            assert response.status_code == 200 if i < 5 else 429
+            assert response.status_code == (200 if i < 5 else 429)
             if i < 5:
                 assert response.text == "test"
             else:
                 assert "error" in response.json()
 
             response = client.get("/t2", headers={"foo": "5"})
-            assert response.status_code == 200 if i < 6 else 429
+            assert response.status_code == (200 if i < 6 else 429)
             if i < 6:
                 assert response.text == "test"
             else:
@@ -412,3 +426,256 @@ class TestDecorators(TestSlowapi):
                 )
                 == 2
             )
+
+    def test_error_message(self, build_starlette_app):
+        app, limiter = build_starlette_app(key_func=get_remote_address)
+
+        @limiter.limit("1/minute", error_message="custom message")
+        async def t1(request: Request):
+            return PlainTextResponse("test")
+
+        @limiter.limit("1/minute", error_message=lambda: "callable message")
+        async def t2(request: Request):
+            return PlainTextResponse("test")
+
+        app.add_route("/t1", t1)
+        app.add_route("/t2", t2)
+
+        client = TestClient(app)
+        for path, message in [("/t1", "custom message"), ("/t2", "callable message")]:
+            assert client.get(path).status_code == 200
+            response = client.get(path)
+            assert response.status_code == 429
+            assert response.json() == {"error": f"Rate limit exceeded: {message}"}
+
+    def test_methods(self, build_starlette_app):
+        app, limiter = build_starlette_app(key_func=get_remote_address)
+
+        @limiter.limit("1/minute", methods=["POST"])
+        async def t1(request: Request):
+            return PlainTextResponse("test")
+
+        app.add_route("/t1", t1, methods=["GET", "POST"])
+
+        client = TestClient(app)
+        for i in range(3):
+            assert client.get("/t1").status_code == 200
+        assert client.post("/t1").status_code == 200
+        assert client.post("/t1").status_code == 429
+
+    def test_dynamic_limit_parsed_once(self, build_starlette_app):
+        app, limiter = build_starlette_app(key_func=get_ipaddr)
+
+        @limiter.limit(lambda: "3/minute;7/hour")
+        def t1(request: Request):
+            return PlainTextResponse("test")
+
+        app.add_route("/t1", t1)
+
+        _parse_many.cache_clear()
+        client = TestClient(app)
+        with mock.patch(
+            "slowapi.wrappers.parse_many", wraps=wrappers.parse_many
+        ) as parse_many:
+            for i in range(0, 5):
+                response = client.get("/t1")
+                assert response.status_code == (200 if i < 3 else 429)
+        assert parse_many.call_count == 1
+
+    def test_invalid_default_limit(self, build_starlette_app):
+        with mock.patch.object(logging.getLogger("slowapi"), "error") as error:
+            app, limiter = build_starlette_app(default_limits=["bogus", "1/minute"])
+        assert error.call_count == 1
+        assert error.call_args[0][1] == "default limits"
+
+        def t1(request: Request):
+            return PlainTextResponse("test")
+
+        app.add_route("/t1", t1)
+
+        client = TestClient(app)
+        assert client.get("/t1").status_code == 200
+        assert client.get("/t1").status_code == 429
+
+    def test_unhashable_key_func(self, build_starlette_app):
+        @dataclass
+        class KeyFunc:
+            key: str
+
+            def __call__(self, request: Request) -> str:
+                return self.key
+
+        # dataclasses with eq and without frozen set __hash__ to None
+        app, limiter = build_starlette_app(
+            key_func=KeyFunc("k"), default_limits=["1/minute"]
+        )
+
+        def t1(request: Request):
+            return PlainTextResponse("test")
+
+        app.add_route("/t1", t1)
+
+        client = TestClient(app)
+        assert client.get("/t1").status_code == 200
+        assert client.get("/t1").status_code == 429
+
+    def test_unhashable_exception_handler(self, build_starlette_app):
+        @dataclass
+        class Handler:
+            status_code: int
+
+            def __call__(self, request: Request, exc: Exception):
+                return PlainTextResponse("limited", status_code=self.status_code)
+
+        app, limiter = build_starlette_app(
+            key_func=get_remote_address, default_limits=["1/minute"]
+        )
+        app.add_exception_handler(RateLimitExceeded, Handler(429))
+
+        def t1(request: Request):
+            return PlainTextResponse("test")
+
+        app.add_route("/t1", t1)
+
+        client = TestClient(app)
+        assert client.get("/t1").status_code == 200
+        response = client.get("/t1")
+        assert response.status_code == 429
+        assert response.text == "limited"
+
+    def test_key_hash(self, build_starlette_app):
+        app, limiter = build_starlette_app(
+            key_func=lambda: "mock", key_hash="blake2b-128"
+        )
+
+        @limiter.limit("1/minute")
+        async def t1(request: Request):
+            return PlainTextResponse("test")
+
+        app.add_route("/t1", t1)
+
+        client = TestClient(app)
+        assert client.get("/t1").status_code == 200
+        assert client.get("/t1").status_code == 429
+        digest = hashlib.blake2b(b"mock//t1", digest_size=16).digest()
+        hashed_key = base64.urlsafe_b64encode(digest).rstrip(b"=").decode()
+        assert len(hashed_key) == 22
+        assert limiter._storage.get(f"LIMITER/{hashed_key}/1/1/minute") == 2
+
+    def test_key_hash_non_str_key(self, build_starlette_app):
+        app, limiter = build_starlette_app(key_func=lambda: 42, key_hash="blake2b-128")
+
+        @limiter.limit("1/minute")
+        async def t1(request: Request):
+            return PlainTextResponse("test")
+
+        app.add_route("/t1", t1)
+
+        client = TestClient(app)
+        assert client.get("/t1").status_code == 200
+        assert client.get("/t1").status_code == 429
+        digest = hashlib.blake2b(b"42//t1", digest_size=16).digest()
+        hashed_key = base64.urlsafe_b64encode(digest).rstrip(b"=").decode()
+        assert limiter._storage.get(f"LIMITER/{hashed_key}/1/1/minute") == 2
+
+    def test_first_matching_route(self, build_starlette_app):
+        app, limiter = build_starlette_app(
+            key_func=get_remote_address, default_limits=["1/minute"]
+        )
+
+        @limiter.exempt
+        async def t1(request: Request):
+            return PlainTextResponse("test")
+
+        async def catch_all(request: Request):
+            return PlainTextResponse("test")
+
+        app.add_route("/t1", t1)
+        app.add_route("/{path}", catch_all)
+
+        client = TestClient(app)
+        # "/t1" is handled by the exempt route, not by the catch-all one
+        for i in range(3):
+            assert client.get("/t1").status_code == 200
+        assert client.get("/t2").status_code == 200
+        assert client.get("/t2").status_code == 429
+
+    def test_storage_error_in_middleware(self, build_starlette_app):
+        app, limiter = build_starlette_app(
+            key_func=get_remote_address, default_limits=["1/minute"]
+        )
+
+        async def t1(request: Request):
+            return PlainTextResponse("test")
+
+        app.add_route("/t1", t1)
+
+        client = TestClient(app)
+        with mock.patch.object(
+            limiter._limiter, "hit", side_effect=ConnectionError("storage is down")
+        ):
+            # not a rate limit breach, it must not be turned into a 429 response
+            with pytest.raises(ConnectionError):
+                client.get("/t1")
+
+    def test_storage_error_handler_in_middleware(self, build_starlette_app):
+        app, limiter = build_starlette_app(
+            key_func=get_remote_address, default_limits=["1/minute"]
+        )
+
+        async def t1(request: Request):
+            return PlainTextResponse("test")
+
+        app.add_route("/t1", t1)
+
+        def storage_error(request: Request, exc: Exception):
+            return PlainTextResponse("storage is down", status_code=503)
+
+        async def async_storage_error(request: Request, exc: Exception):
+            return storage_error(request, exc)
+
+        client = TestClient(app)
+        with mock.patch.object(
+            limiter._limiter, "hit", side_effect=ConnectionError("storage is down")
+        ):
+            app.add_exception_handler(ConnectionError, storage_error)
+            response = client.get("/t1")
+            assert response.status_code == 503
+            assert response.text == "storage is down"
+
+            app.add_exception_handler(ConnectionError, async_storage_error)
+            if app.user_middleware[0].cls is SlowAPIMiddleware:
+                # async handlers can't run there, and the rate limit handler can't
+                # handle a storage error
+                with pytest.raises(ConnectionError):
+                    client.get("/t1")
+            else:
+                response = client.get("/t1")
+                assert response.status_code == 503
+                assert response.text == "storage is down"
+
+
+@pytest.mark.parametrize("tz", ["UTC", "America/New_York", "Asia/Tokyo"])
+def test_determine_retry_time(monkeypatch, tz):
+    monkeypatch.setenv("TZ", tz)
+    time.tzset()
+    try:
+        limiter = Limiter(key_func=get_remote_address)
+        with hiro.Timeline().freeze():
+            now = int(time.time())
+            assert limiter._determine_retry_time(formatdate(now + 30)) == now + 30
+            assert (
+                limiter._determine_retry_time(formatdate(now + 30, usegmt=True))
+                == now + 30
+            )
+            assert limiter._determine_retry_time("30") == now + 30
+            with pytest.raises(ValueError):
+                limiter._determine_retry_time("soon")
+    finally:
+        monkeypatch.undo()
+        time.tzset()
+
+
+def test_invalid_key_hash():
+    with pytest.raises(ConfigurationError, match="Invalid key hash md5"):
+        Limiter(key_func=get_remote_address, key_hash="md5")  # type: ignore